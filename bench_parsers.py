@@ -0,0 +1,166 @@
+"""
+解析热点的离线基准测试，不访问安居客、不连接数据库。
+用法:
+    python bench_parsers.py                      # 使用 bench_fixtures 下的样例页面
+    python bench_parsers.py --extra debug_html   # 额外用爬取时保存的调试页面测试 is_login_page
+    python bench_parsers.py --save bench.json    # 保存本次结果作为基线
+    python bench_parsers.py --baseline bench.json  # 与基线对比，变慢超过阈值时返回非0
+
+样例页面按文件名前缀分类:
+    home_*    城市小区主页面（区域、价格筛选）
+    list_*    小区列表页
+    empty_*   “暂未找到相关小区”的空价位页
+    detail_*  小区详情页
+    login_*   登录页
+    verify_*  “安全验证”页
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import main as crawler
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_fixtures')
+KINDS = ('home', 'list', 'empty', 'detail', 'login', 'verify')
+
+
+def load_fixtures(fixture_dir: str) -> Dict[str, List[str]]:
+    pages = {kind: [] for kind in KINDS}
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*.html'))):
+        kind = os.path.basename(path).split('_', 1)[0]
+        if kind in pages:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages[kind].append(f.read())
+    return pages
+
+
+def load_extra_pages(html_dir: str) -> List[str]:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(html_dir, '**', '*.html'), recursive=True)):
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench(name: str, func: Callable, pages: List[str], rounds: int) -> Dict:
+    """预热一轮后对每个页面重复调用 rounds 次，统计单页耗时"""
+    for html in pages:
+        func(html)
+    samples = []
+    for _ in range(rounds):
+        for html in pages:
+            start = time.perf_counter()
+            func(html)
+            samples.append(time.perf_counter() - start)
+    mean = statistics.mean(samples)
+    samples.sort()
+    return {
+        'name': name,
+        'pages': len(pages),
+        'mean_ms': mean * 1000,
+        'p50_ms': samples[len(samples) // 2] * 1000,
+        'p95_ms': samples[int(len(samples) * 0.95) - 1] * 1000 if len(samples) > 1 else mean * 1000,
+        'pages_per_sec': 1 / mean if mean > 0 else 0.0,
+    }
+
+
+def check_consistency(pages: Dict[str, List[str]], extra: List[str]) -> List[str]:
+    """解析结果正确性检查：两种解析后端结果一致，登录页预筛与完整检查结论一致"""
+    problems = []
+    for html in pages['detail'] + pages['list']:
+        a = crawler.get_house_info(html, backend='lxml')
+        b = crawler.get_house_info(html, backend='pyquery')
+        a.pop('scrape_time'), b.pop('scrape_time')
+        if a != b:
+            problems.append(f"get_house_info 两种后端结果不一致: {a} != {b}")
+        if crawler.get_houses_url(html, backend='lxml') != crawler.get_houses_url(html, backend='pyquery'):
+            problems.append("get_houses_url 两种后端结果不一致")
+    for kind, kind_pages in pages.items():
+        for html in kind_pages:
+            if crawler.is_login_page(html) != (kind == 'login'):
+                problems.append(f"is_login_page 对 {kind} 页面判定错误")
+    for html in extra:
+        if crawler.is_login_page(html) != crawler._is_login_page_full(html):
+            problems.append("is_login_page 预筛与完整检查结论不一致（调试页面）")
+    return problems
+
+
+def run(fixture_dir: str, extra_dir: str, rounds: int) -> Tuple[List[Dict], List[str]]:
+    pages = load_fixtures(fixture_dir)
+    extra = load_extra_pages(extra_dir) if extra_dir else []
+    all_pages = [html for kind in KINDS for html in pages[kind]] + extra
+    count_pages = pages['list'] + pages['empty']
+
+    problems = check_consistency(pages, extra)
+    for problem in problems:
+        print(f"[!] {problem}")
+
+    cases = [
+        ('get_houses_url[lxml]', lambda h: crawler.get_houses_url(h, backend='lxml'), pages['list']),
+        ('get_houses_url[pyquery]', lambda h: crawler.get_houses_url(h, backend='pyquery'), pages['list']),
+        ('get_house_info[lxml]', lambda h: crawler.get_house_info(h, backend='lxml'), pages['detail']),
+        ('get_house_info[pyquery]', lambda h: crawler.get_house_info(h, backend='pyquery'), pages['detail']),
+        ('extract_total_count', lambda h: crawler.extract_total_count(h, crawler.COMMON_BASE_URL), count_pages),
+        ('is_login_page', crawler.is_login_page, all_pages),
+        ('is_login_page[full]', crawler._is_login_page_full, all_pages),
+        ('parse_regions_prices', crawler.parse_regions_prices, pages['home']),
+    ]
+    results = [bench(name, func, case_pages, rounds) for name, func, case_pages in cases if case_pages]
+    return results, problems
+
+
+def print_results(results: List[Dict], baseline: Dict[str, Dict] = None):
+    header = f"{'函数':<26}{'页数':>6}{'平均ms/页':>12}{'p50 ms':>10}{'p95 ms':>10}{'页/秒':>10}"
+    if baseline:
+        header += f"{'对比基线':>10}"
+    print(header)
+    print('-' * 84)
+    for r in results:
+        line = f"{r['name']:<26}{r['pages']:>6}{r['mean_ms']:>12.3f}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['pages_per_sec']:>10.0f}"
+        if baseline and r['name'] in baseline:
+            line += f"{r['p50_ms'] / baseline[r['name']]['p50_ms'] - 1:>+10.1%}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='解析热点离线基准测试')
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help='样例页面目录')
+    parser.add_argument('--extra', default=None, help=f'额外页面目录，如 {crawler.DEBUG_HTML_DIR}')
+    parser.add_argument('--rounds', type=int, default=20, help='每个页面重复次数')
+    parser.add_argument('--save', default=None, help='保存结果为JSON基线')
+    parser.add_argument('--baseline', default=None, help='与JSON基线对比')
+    parser.add_argument('--threshold', type=float, default=0.2, help='相对基线允许的最大变慢比例')
+    args = parser.parse_args()
+
+    # 解析函数每页都会打日志（空价位页还会打警告），计时期间关闭
+    logging.disable(logging.WARNING)
+    results, problems = run(args.fixtures, args.extra, args.rounds)
+    logging.disable(logging.NOTSET)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = {r['name']: r for r in json.load(f)}
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.save}")
+
+    slower = [r['name'] for r in results
+              if baseline and r['name'] in baseline
+              and r['p50_ms'] > baseline[r['name']]['p50_ms'] * (1 + args.threshold)]
+    if slower:
+        print(f"[!] 以下函数比基线慢超过 {args.threshold:.0%}: {slower}")
+    sys.exit(1 if problems or slower else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+解析函数的离线测试，使用 bench_fixtures 下的样例页面，不访问网络、不连接数据库。
+用法:
+    python -m pytest -q test_parsers.py
+"""
+import glob
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import main as crawler  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_fixtures')
+
+
+def load(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def entity_encode(text, hex_form=False):
+    return ''.join(f'&#x{ord(c):x};' if hex_form else f'&#{ord(c)};' for c in text)
+
+
+def login_variants():
+    """登录页特征文本被写成数字实体、被注释或标签拆开的页面"""
+    login = load('login_sms.html')
+    variants = {}
+    for hex_form in (False, True):
+        encoded = login
+        for sig in crawler.LOGIN_PAGE_SIGNATURES:
+            encoded = encoded.replace(sig, entity_encode(sig, hex_form))
+        variants[f"login_entities{'_hex' if hex_form else ''}"] = encoded
+    body = '<html><head><title>安居客</title></head><body>{}<div>登录</div></body></html>'
+    variants['title_split_by_comment'] = body.format('<div>扫码<!---->登录</div>')
+    variants['title_split_by_tag'] = body.format('<div><span>扫</span>码登录</div>')
+    variants['title_split_at_end'] = body.format('<div>账号密码登<i></i>录</div>')
+    variants['button_as_entities'] = body.format('<div>手机登录</div>').replace('<div>登录</div>',
+                                                                            f"<div>{entity_encode('登录')}</div>")
+    return variants
+
+
+FIXTURES = sorted(os.path.basename(p) for p in glob.glob(os.path.join(FIXTURE_DIR, '*.html')))
+
+
+@pytest.mark.parametrize('name', FIXTURES)
+def test_login_prefilter_matches_full_check_on_fixtures(name):
+    html = load(name)
+    assert crawler.is_login_page(html) == crawler._is_login_page_full(html)
+    assert crawler.is_login_page(html) == name.startswith('login_')
+
+
+LOGIN_VARIANTS = login_variants()
+
+
+@pytest.mark.parametrize('name', sorted(LOGIN_VARIANTS))
+def test_login_prefilter_matches_full_check_on_edge_cases(name):
+    html = LOGIN_VARIANTS[name]
+    assert crawler._is_login_page_full(html), name  # 这些页面都应被判为登录页
+    assert crawler.is_login_page(html) == crawler._is_login_page_full(html)
+
+
+# 详情页数值字段的各种写法 -> (均价, 户数, 面积, 容积率, 年份, 产权)
+NUMERIC_CASES = [
+    ({'price': '19453', 'number': '1610户', 'space': '30万㎡', 'ratio': '4.23', 'time': '2014年', 'owner': '70年'},
+     (19453.0, 1610, 300000.0, 4.23, 2014, 70)),
+    ({'price': '1.2万元/㎡', 'number': '1.5万户', 'space': '85000㎡', 'ratio': '2', 'time': '2010-2014年',
+      'owner': '40/70年'},
+     (12000.0, 15000, 85000.0, 2.0, 2010, 40)),
+    ({'price': '12,345元/㎡', 'number': '1,610户', 'space': '1.15万㎡', 'ratio': '暂无数据', 'time': '暂无数据',
+      'owner': ''},
+     (12345.0, 1610, 11500.0, None, None, None)),
+    ({'price': None, 'number': '1.15万户'}, (None, 11500, None, None, None, None)),
+]
+
+
+@pytest.mark.parametrize('info,expected', NUMERIC_CASES)
+def test_numeric_fields(info, expected):
+    fields = crawler.numeric_fields(info)
+    assert tuple(fields[field] for _, field, _ in crawler.NUMERIC_FIELDS) == pytest.approx(expected)
+    assert all(isinstance(fields[field], int) for _, field, kind in crawler.NUMERIC_FIELDS
+               if kind in crawler._INT_KINDS and fields[field] is not None)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.status_code = 200
+        self.encoding = self.apparent_encoding = 'utf-8'
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def fake_fetch(monkeypatch, tmp_path):
+    """get_page 走一个临时目录的响应缓存，http_get 按 pages 返回页面并记录请求次数"""
+    pages, calls = {}, []
+
+    def http_get(url, timeout=15, headers=None):
+        calls.append(url)
+        return FakeResponse(pages[url])
+
+    monkeypatch.setattr(crawler, 'http_get', http_get)
+    monkeypatch.setattr(crawler, '_response_cache', crawler.ResponseCache(cache_dir=str(tmp_path)))
+    monkeypatch.setattr(crawler, 'RETRY_TIMES', 1)
+    return pages, calls
+
+
+def test_captcha_page_not_cached(fake_fetch):
+    pages, calls = fake_fetch
+    url = 'https://chongqing.anjuke.com/community/yubei/m3094/'
+    pages[url] = load('verify_geetest.html')
+    assert crawler.is_captcha_page(pages[url])
+    assert crawler.get_page(url) is None
+    assert crawler.get_page(url) is None
+    assert len(calls) == 2  # 拦截页没有写入缓存，第二次仍然请求
+
+    pages[url] = load('list_yubei_m3094_p1.html')
+    assert crawler.get_page(url) == pages[url]
+    assert crawler.get_page(url) == pages[url]
+    assert len(calls) == 3  # 正常页面第二次由缓存返回
+    assert crawler.get_page(url, bypass_cache=True) == pages[url]
+    assert len(calls) == 4
+
+
+FULL_DOC = {'url': 'https://chongqing.anjuke.com/community/view/348812', 'community_id': '348812', 'city': 'chongqing',
+            'region_name': '渝北', 'region_path': 'yubei', 'price_segment': 'm3094', 'title': '龙湖花园',
+            'price': '19453', 'lat': 29.6, 'lng': 106.5, 'geo_status': 'ok', 'scrape_time': '2026/01/01 00:00:00'}
+PARTIAL_DOC = {'url': FULL_DOC['url'], 'price': '20100', 'scrape_time': '2026/02/01 00:00:00'}
+
+
+def test_sqlite_partial_upsert_keeps_stored_fields(tmp_path):
+    sink = crawler.SQLiteSink(str(tmp_path / 'xiaoqu.db'), table='xiaoqu')
+    sink.write([dict(FULL_DOC)])
+    sink.write([dict(PARTIAL_DOC)])
+    row = sink.conn.execute('SELECT city, region_name, price_segment, title, price, lat, scrape_time FROM xiaoqu').fetchall()
+    sink.close()
+    assert row == [('chongqing', '渝北', 'm3094', '龙湖花园', '20100', 29.6, '2026/02/01 00:00:00')]
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = {doc['url']: doc for doc in docs}
+
+    def find(self, query, projection):
+        return [{k: v for k, v in self.docs[url].items() if projection.get(k)}
+                for url in query['url']['$in'] if url in self.docs]
+
+
+class RecordingSink(crawler.Sink):
+    """只能追加的目标，记录收到的文档"""
+    name = 'recording'
+    merges_partial = False
+
+    def __init__(self):
+        self.docs = []
+
+    def write(self, docs):
+        self.docs.extend(docs)
+        return set()
+
+
+def test_writer_completes_partial_docs_for_append_only_sinks(monkeypatch):
+    monkeypatch.setattr(crawler, 'get_collection', lambda: FakeCollection([dict(FULL_DOC)]))
+    monkeypatch.setattr(crawler, 'mark_seen', lambda docs: None)
+    sink = RecordingSink()
+    writer = crawler.BulkWriter([sink], flush_interval=60)
+    writer.add(dict(PARTIAL_DOC))
+    assert writer.close() == 0
+    assert sink.docs == [{**FULL_DOC, **PARTIAL_DOC}]